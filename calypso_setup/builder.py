@@ -1,31 +1,61 @@
 """Core routines for preparing CALYPSO + VASP calculation directories."""
 from __future__ import annotations
 
+import functools
+import logging
 import math
+import mmap
 import os
 import re
 import shutil
+import string
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple, Union
+from typing import BinaryIO, Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
 
 
+_log = logging.getLogger(__name__)
+
 DEFAULT_POTCAR_ROOT = Path(
     os.environ.get("CALYSETUP_POTCAR_ROOT", "/path/to/vasp/potpaw/PAW_PBE")
 )
 
+# POTCAR variants in order of preference for each element.
+_POTCAR_SUFFIXES = ("_pv", "_sv", "", "_s")
+
+_RWIGS_RE = re.compile(rb"RWIGS\s*=\s*([-+]?\d*\.?\d+)", re.IGNORECASE)
+
+# Matches the two input.dat lines that scale with the formula multiplier.
+_ADJUST_INPUT_DAT_RE = re.compile(
+    r"^(?:SystemName = [ \t]*(?P<name>.*?)|NumberOfAtoms = [ \t]*(?P<atoms>.*?))[ \t\r]*(?:\n|\Z)",
+    re.MULTILINE,
+)
+
 
 def _format_pstress_kbar(pressure_gpa: float) -> str:
     """Convert pressure in GPa to kbar for VASP's PSTRESS and return formatted string."""
-    pstress_kbar = pressure_gpa * 10.0
-    if pstress_kbar < 0:
+    if pressure_gpa < 0:
         raise ValueError("Pressure must be non-negative.")
-    # Prefer integer formatting when possible (e.g., 250 GPa -> 2500 kbar).
+    # Whole-GPa inputs (the common case) convert exactly in integer arithmetic.
+    if isinstance(pressure_gpa, int) or pressure_gpa.is_integer():
+        return str(int(pressure_gpa) * 10)
+    pstress_kbar = pressure_gpa * 10.0
+    # Prefer integer formatting when possible (e.g., 0.5 GPa -> 5 kbar).
     if abs(pstress_kbar - round(pstress_kbar)) < 1e-9:
         return str(int(round(pstress_kbar)))
     return f"{pstress_kbar:.6g}"
 
 
+@functools.lru_cache(maxsize=32)
+def _list_potcar_dirs(root: Path) -> FrozenSet[str]:
+    """Return the names of subdirectories under *root* (cached per root path).
+
+    Call ``_list_potcar_dirs.cache_clear()`` after modifying a POTCAR tree.
+    """
+    with os.scandir(root) as entries:
+        return frozenset(entry.name for entry in entries if entry.is_dir())
+
 
 @dataclass
 class SetupConfig:
@@ -45,63 +75,96 @@ class SetupConfig:
     layer_type_matrix: Optional[List[List[int]]] = None
 
 
+def _stream_potcar(potcar_path: Path, out: BinaryIO) -> List[float]:
+    """Append *potcar_path* to *out* and return its leading RWIGS values.
+
+    The file is memory-mapped so both the copy and the RWIGS scan read straight
+    from the page cache instead of a Python-level copy of the whole POTCAR.
+    """
+
+    with potcar_path.open("rb") as src:
+        if os.fstat(src.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            out.write(data)
+            # RWIGS appears either as a "RWIGS = a; RWIGS = b" pair or once per
+            # file, near the header, so stop scanning after the second hit.
+            vals: List[float] = []
+            for match in _RWIGS_RE.finditer(data):
+                vals.append(float(match.group(1)))
+                if len(vals) >= 2:
+                    break
+    return vals
+
+
 def find_potcar(
     elements: Sequence[str],
     destination: Path,
     potcar_root: Path = DEFAULT_POTCAR_ROOT,
 ) -> Tuple[Dict[str, float], Optional[float]]:
-    """Concatenate POTCAR files for *elements* into *destination* and return RWIGS data."""
+    """Concatenate POTCAR files for *elements* into *destination* and return RWIGS data.
 
-    destination = Path(destination)
-    destination.mkdir(parents=True, exist_ok=True)
-    potcar_root = Path(potcar_root)
+    *destination* must already exist; the caller owns directory creation.
+    """
 
-    pair_re = re.compile(
-        r"RWIGS\s*=\s*([-+]?\d*\.?\d+)\s*;\s*RWIGS\s*=\s*([-+]?\d*\.?\d+)", re.IGNORECASE
-    )
-    single_re = re.compile(r"RWIGS\s*=\s*([-+]?\d*\.?\d+)", re.IGNORECASE)
+    destination = Path(destination)
+    # Absolute so the cached listing stays tied to one tree across chdir calls.
+    potcar_root = Path(os.path.abspath(potcar_root))
 
-    potcar_content: List[str] = []
     rwigs_values: Dict[str, float] = {}
     picked_rwigs: List[float] = []
 
-    available_dirs = {entry.name for entry in potcar_root.iterdir() if entry.is_dir()}
+    available_dirs = _list_potcar_dirs(potcar_root)
 
+    potcar_paths: List[Path] = []
     for element in elements:
-        potcar_path = next(
-            (
-                potcar_root / f"{element}{suffix}" / "POTCAR"
-                for suffix in ("_pv", "_sv", "", "_s")
-                if f"{element}{suffix}" in available_dirs
-            ),
-            None,
-        )
-        if potcar_path is None:
-            raise FileNotFoundError(f"No suitable POTCAR found for {element} in {potcar_root}")
-
-        text = potcar_path.read_text()
-        potcar_content.append(text)
-
-        match = pair_re.search(text)
-        if match:
-            chosen = min(float(match.group(1)), float(match.group(2)))
+        for suffix in _POTCAR_SUFFIXES:
+            name = element + suffix
+            if name in available_dirs:
+                potcar_paths.append(potcar_root / name / "POTCAR")
+                break
         else:
-            vals = [float(val) for val in single_re.findall(text)]
-            if not vals:
-                raise ValueError(f"No RWIGS entry found in {potcar_path}")
-            chosen = min(vals)
-
-        rwigs_values[element] = chosen
-        picked_rwigs.append(chosen)
-        print(f"{element}: POTCAR read from {potcar_path}")
+            raise FileNotFoundError(f"No suitable POTCAR found for {element} in {potcar_root}")
 
+    # Build the combined file under a temporary name so a failure part-way
+    # through never truncates or leaves behind a partial POTCAR.
     potcar_file = destination / "POTCAR"
-    potcar_file.write_text("".join(potcar_content))
+    partial_file = destination / "POTCAR.partial"
+    try:
+        with partial_file.open("wb") as out:
+            for element, potcar_path in zip(elements, potcar_paths):
+                vals = _stream_potcar(potcar_path, out)
+                if not vals:
+                    raise ValueError(f"No RWIGS entry found in {potcar_path}")
+                chosen = min(vals)
+
+                rwigs_values[element] = chosen
+                picked_rwigs.append(chosen)
+                _log.info("%s: POTCAR read from %s", element, potcar_path)
+    except BaseException:
+        partial_file.unlink(missing_ok=True)
+        raise
+    os.replace(partial_file, potcar_file)
 
     min_latom_dis = min(picked_rwigs) if picked_rwigs else None
     return rwigs_values, min_latom_dis
 
 
+def _clone(src: Path, dst: Path) -> None:
+    """Hardlink *src* to *dst*, falling back to a copy across filesystems.
+
+    Linked files share an inode, so in-place edits show up in every link. Any
+    existing *dst* is unlinked first so a stale link from an earlier run is
+    replaced rather than written through.
+    """
+
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy(src, dst)
+
+
 def create_incar(content: str, directory: Path, filename: str) -> None:
     """Write an INCAR template to *directory*."""
 
@@ -114,6 +177,46 @@ def create_simple_file(filename: str, content: str, directory: Path) -> None:
     (Path(directory) / filename).write_text(content)
 
 
+# Static input.dat text surrounding the per-system fields in create_input_dat.
+_INPUT_DAT_HEADER_LINES = (
+    "################################ The Basic Parameters of CALYPSO ################################",
+    "# A string of one or several words contain a descriptCALYPSOive name of the system (max. 40 characters).",
+)
+
+_INPUT_DAT_SEARCH_LINES = (
+    "# It determines which algorithm should be adopted in the simulation.",
+    "Ialgo = 2",
+    "# Ialgo = 1 for Global PSO",
+    "# Ialgo = 2 for Local PSO (default value)",
+    "# The proportion of the structures generated by PSO.",
+    "PsoRatio = 0.6",
+    "# The popu2ation size. Normally, it has a larger number for larger systems.",
+    "PopSize = 40",
+    "# It determines which local optimization method should be interfaced in the simulation.",
+    "ICode = 1",
+    "# ICode= 1 interfaced with VASP",
+    "# ICode= 2 interfaced with SIESTA",
+    "# ICode= 3 interfaced with GULP",
+    "# The number of lbest for local PSO",
+    "NumberOfLbest = 4",
+    "# The Number of local optimization for each structure.",
+    "NumberOfLocalOptim = 2",
+    "# The command to perform local optimiztion calculation (e.g., VASP, SIESTA) on your computer.",
+    "Command = sh submit.sh",
+    "# The Max step for iteration",
+    "MaxStep = 50",
+    "# If True, a previous calculation will be continued.",
+    "PickUp = F",
+    "# At which step will the previous calculation be picked up.",
+    "PickStep =",
+    "MaxTime = 3600",
+    "# If True, the local optimizations performed by parallel",
+    "Parallel = T",
+    "# The number node for parallel",
+    "NumberOfParallel= 3",
+)
+
+
 def create_input_dat(
     directory: Path,
     elements: Sequence[str],
@@ -128,101 +231,80 @@ def create_input_dat(
     layer_type_matrix: Optional[Sequence[Sequence[int]]] = None,
     formula_value: int = 1,
 ) -> None:
-    """Generate *input.dat* for CALYPSO."""
+    """Generate *input.dat* for CALYPSO.
+
+    *directory* must already exist; the caller owns directory creation.
+    """
 
     directory = Path(directory)
-    directory.mkdir(parents=True, exist_ok=True)
 
     system_name = "".join(f"{el}{count}" for el, count in zip(elements, atom_counts))
     name_of_atoms = " ".join(elements)
     number_of_atoms = " ".join(str(val) for val in atom_counts)
-    distance_of_ion_str = "\n".join(
-        " ".join(f"{value:.6f}" for value in row) for row in distance_of_ion_matrix
-    )
-
-    layer_type_str = ""
-    if layer_type_matrix:
-        layer_type_str = "\n".join(" ".join(str(val) for val in layer) for layer in layer_type_matrix)
+    # The matrix is square, so one row format serves every row.
+    row_fmt = " ".join(["{:.6f}"] * len(distance_of_ion_matrix))
+    distance_of_ion_str = "\n".join(row_fmt.format(*row) for row in distance_of_ion_matrix)
+
+    parts = [
+        *_INPUT_DAT_HEADER_LINES,
+        f"SystemName = {system_name}",
+        "# Number of different atomic species in the simulation.",
+        f"NumberOfSpecies = {len(elements)}",
+        "# Element symbols of the different chemical species.",
+        f"NameOfAtoms = {name_of_atoms}",
+        "# Number of atoms for each chemical species in one formula unit.",
+        f"NumberOfAtoms = {number_of_atoms}",
+        "# The range of formula unit per cell in your simulation.",
+        "NumberOfFormula = 1 1",
+        "# The volume per formula unit. Unit is in angstrom^3.",
+        "Volume= 0",
+        "# Minimal distance between atoms of each chemical species. Unit is in angstrom.",
+        "@DistanceOfIon",
+        distance_of_ion_str,
+        "@End",
+        *_INPUT_DAT_SEARCH_LINES,
+        "",  # blank separator before the optional 2D block
+    ]
 
-    two_d_parameters = ""
     if is_2d:
         if base_area is None:
             raise ValueError("base_area must be provided for 2D calculations")
+        layer_type_str = ""
+        if layer_type_matrix:
+            layer_type_str = "\n".join(
+                " ".join(str(val) for val in layer) for layer in layer_type_matrix
+            )
         adjusted_area = base_area * formula_value
         delta_z = 0.1 if relax_z else 0.0
         latom_line = f"LAtom_Dis = {min_latom_dis}" if min_latom_dis is not None else ""
-        two_d_parameters = f"""
-######### The Parameters For 2D Structure Prediction #############
-# If True, a 2D structure prediction is performed.
-2D = True
-# The number of layers
-MultiLayer = {num_layers}
-# The Area of 2D system
-Area = {adjusted_area}
-# The distortion value along the C axis
-DeltaZ = {delta_z}
-# The gap between two layers
-LayerGap=5
-# The vacuum gap between the top surface of the slab and the top lattice, and between the bottom surface of the slab and the bottom lattice.
-VacuumGap=20
-# The number atoms for each layer
-@LayerType
-{layer_type_str}
-@End
-# Minimal distance between atoms of each chemical species. Unit is in angstrom.
-{latom_line}
-########################END 2D Parameters #########################
-"""
-
-    input_content = f"""################################ The Basic Parameters of CALYPSO ################################
-# A string of one or several words contain a descriptCALYPSOive name of the system (max. 40 characters).
-SystemName = {system_name}
-# Number of different atomic species in the simulation.
-NumberOfSpecies = {len(elements)}
-# Element symbols of the different chemical species.
-NameOfAtoms = {name_of_atoms}
-# Number of atoms for each chemical species in one formula unit.
-NumberOfAtoms = {number_of_atoms}
-# The range of formula unit per cell in your simulation.
-NumberOfFormula = 1 1
-# The volume per formula unit. Unit is in angstrom^3.
-Volume= 0
-# Minimal distance between atoms of each chemical species. Unit is in angstrom.
-@DistanceOfIon
-{distance_of_ion_str}
-@End
-# It determines which algorithm should be adopted in the simulation.
-Ialgo = 2
-# Ialgo = 1 for Global PSO
-# Ialgo = 2 for Local PSO (default value)
-# The proportion of the structures generated by PSO.
-PsoRatio = 0.6
-# The popu2ation size. Normally, it has a larger number for larger systems.
-PopSize = 40
-# It determines which local optimization method should be interfaced in the simulation.
-ICode = 1
-# ICode= 1 interfaced with VASP
-# ICode= 2 interfaced with SIESTA
-# ICode= 3 interfaced with GULP
-# The number of lbest for local PSO
-NumberOfLbest = 4
-# The Number of local optimization for each structure.
-NumberOfLocalOptim = 2
-# The command to perform local optimiztion calculation (e.g., VASP, SIESTA) on your computer.
-Command = sh submit.sh
-# The Max step for iteration
-MaxStep = 50
-# If True, a previous calculation will be continued.
-PickUp = F
-# At which step will the previous calculation be picked up.
-PickStep =
-MaxTime = 3600
-# If True, the local optimizations performed by parallel
-Parallel = T
-# The number node for parallel
-NumberOfParallel= 3
-{two_d_parameters}
-"""
+        parts.extend(
+            [
+                "######### The Parameters For 2D Structure Prediction #############",
+                "# If True, a 2D structure prediction is performed.",
+                "2D = True",
+                "# The number of layers",
+                f"MultiLayer = {num_layers}",
+                "# The Area of 2D system",
+                f"Area = {adjusted_area}",
+                "# The distortion value along the C axis",
+                f"DeltaZ = {delta_z}",
+                "# The gap between two layers",
+                "LayerGap=5",
+                "# The vacuum gap between the top surface of the slab and the top lattice,"
+                " and between the bottom surface of the slab and the bottom lattice.",
+                "VacuumGap=20",
+                "# The number atoms for each layer",
+                "@LayerType",
+                layer_type_str,
+                "@End",
+                "# Minimal distance between atoms of each chemical species. Unit is in angstrom.",
+                latom_line,
+                "########################END 2D Parameters #########################",
+                "",
+            ]
+        )
+
+    input_content = "\n".join(parts) + "\n"
 
     (directory / "input.dat").write_text(input_content)
 
@@ -230,50 +312,28 @@ NumberOfParallel= 3
 def calculate_distance_of_ion(rwigs_values: Dict[str, float]) -> List[List[float]]:
     """Construct the DistanceOfIon block."""
 
-    elements = list(rwigs_values.keys())
-    matrix: List[List[float]] = []
-    for element_i in elements:
-        row = []
-        for element_j in elements:
-            row.append((rwigs_values[element_i] + rwigs_values[element_j]) * 0.6)
-        matrix.append(row)
-    return matrix
+    radii = list(rwigs_values.values())
+    return [[(r_i + r_j) * 0.6 for r_j in radii] for r_i in radii]
 
 
 def adjust_input_dat(file_path: Path, multiplier: int) -> None:
     """Scale SystemName/NumberOfAtoms by *multiplier* in an existing input.dat."""
 
     file_path = Path(file_path)
-    lines = file_path.read_text().splitlines(True)
-    new_content: List[str] = []
-
-    for line in lines:
-        if line.startswith("SystemName = "):
-            system_name = line.split("=", 1)[1].strip()
-            new_content.append(f"SystemName = {system_name}{multiplier}\n")
-        elif line.startswith("NumberOfAtoms = "):
-            atoms = line.split("=", 1)[1].strip().split()
-            scaled = " ".join(str(int(atom) * multiplier) for atom in atoms)
-            new_content.append(f"NumberOfAtoms = {scaled}\n")
-        else:
-            new_content.append(line)
 
-    file_path.write_text("".join(new_content))
+    def _scale(match: re.Match[str]) -> str:
+        atoms = match.group("atoms")
+        if atoms is None:
+            return f"SystemName = {match.group('name')}{multiplier}\n"
+        scaled = " ".join(str(int(atom) * multiplier) for atom in atoms.split())
+        return f"NumberOfAtoms = {scaled}\n"
 
+    file_path.write_text(_ADJUST_INPUT_DAT_RE.sub(_scale, file_path.read_text()))
 
-def setup_calypso(config: SetupConfig) -> List[Path]:
-    """Generate CALYPSO calculation directories based on *config*."""
-
-    destination = config.destination.resolve()
-    destination.mkdir(parents=True, exist_ok=True)
 
-    rwigs_values, min_latom_dis = find_potcar(
-        config.elements, destination, potcar_root=config.potcar_root
-    )
-
-    pstress_kbar_str = _format_pstress_kbar(config.pressure_gpa)
-
-    incar_1_content = f"""SYSTEM = opt
+# Job-file templates; literal shell ``$`` characters are escaped as ``$$``.
+_INCAR_1_TMPL = string.Template(
+    """SYSTEM = opt
 PREC = Accurate
 ENCUT = 300
 KSPACING = 0.5
@@ -290,8 +350,11 @@ LREAL = Auto
 LCHARG = .F.
 LWAVE = .F.
 POTIM = 0.02
-PSTRESS = {pstress_kbar_str}"""
-    incar_2_content = f"""SYSTEM = opt
+PSTRESS = $pstress"""
+)
+
+_INCAR_2_TMPL = string.Template(
+    """SYSTEM = opt
 PREC = Accurate
 ENCUT = 400
 KSPACING = 0.25
@@ -308,18 +371,11 @@ LREAL = Auto
 LCHARG = .F.
 LWAVE = .F.
 POTIM = 0.02
-PSTRESS = {pstress_kbar_str}"""
-
-    create_incar(incar_1_content, destination, "INCAR_1")
-    create_incar(incar_2_content, destination, "INCAR_2")
-
-    calypso_exec = str(config.calypso_executable)
-    vasp_exec = str(config.vasp_executable)
-
-    calypso_fullnode_script = "calypso_fullnode.sh"
-    calypso_script = "calypso.sh"
+PSTRESS = $pstress"""
+)
 
-    calypso_fullnode_content = f"""#!/bin/bash
+_CALYPSO_FULLNODE_TMPL = string.Template(
+    """#!/bin/bash
 #SBATCH --job-name=calypso-fullnode
 #SBATCH --partition=compute
 #SBATCH --nodes=1
@@ -333,11 +389,13 @@ ulimit -s unlimited
 ulimit -c unlimited
 ulimit -d unlimited
 
-scontrol show hostname "$SLURM_NODELIST" > machinefile
+scontrol show hostname "$$SLURM_NODELIST" > machinefile
 
-{calypso_exec}   > caly.log 2>&1"""
+$calypso_exec   > caly.log 2>&1"""
+)
 
-    calypso_content = f"""#!/bin/bash
+_CALYPSO_TMPL = string.Template(
+    """#!/bin/bash
 #SBATCH --job-name=calypso
 #SBATCH --partition=compute
 #SBATCH -N 1
@@ -351,18 +409,48 @@ ulimit -s unlimited
 ulimit -c unlimited
 ulimit -d unlimited
 
-{calypso_exec}"""
+$calypso_exec"""
+)
 
-    submit_sh_content = f"""#!/bin/bash
+_SUBMIT_SH_TMPL = string.Template(
+    """#!/bin/bash
 set -e
-export OMP_NUM_THREADS=${{OMP_NUM_THREADS:-1}}
+export OMP_NUM_THREADS=$${OMP_NUM_THREADS:-1}
 
 srun --ntasks=16 --cpus-per-task=1 \\
-        {vasp_exec} > vasp.out 2> vasp.err"""
+        $vasp_exec > vasp.out 2> vasp.err"""
+)
+
+
+def setup_calypso(config: SetupConfig) -> List[Path]:
+    """Generate CALYPSO calculation directories based on *config*.
+
+    Repeated formula multipliers are built once, so the returned list holds one
+    path per distinct multiplier, in first-seen order.
+    """
 
-    create_simple_file(calypso_fullnode_script, calypso_fullnode_content, destination)
-    create_simple_file(calypso_script, calypso_content, destination)
-    create_simple_file("submit.sh", submit_sh_content, destination)
+    # abspath is enough here; resolving symlinks would walk every path component.
+    destination = Path(os.path.abspath(config.destination))
+    destination.mkdir(parents=True, exist_ok=True)
+
+    rwigs_values, min_latom_dis = find_potcar(
+        config.elements, destination, potcar_root=config.potcar_root
+    )
+
+    pstress_kbar_str = _format_pstress_kbar(config.pressure_gpa)
+
+    incar_1_content = _INCAR_1_TMPL.substitute(pstress=pstress_kbar_str)
+    incar_2_content = _INCAR_2_TMPL.substitute(pstress=pstress_kbar_str)
+
+    calypso_exec = str(config.calypso_executable)
+    vasp_exec = str(config.vasp_executable)
+
+    calypso_fullnode_script = "calypso_fullnode.sh"
+    calypso_script = "calypso.sh"
+
+    calypso_fullnode_content = _CALYPSO_FULLNODE_TMPL.substitute(calypso_exec=calypso_exec)
+    calypso_content = _CALYPSO_TMPL.substitute(calypso_exec=calypso_exec)
+    submit_sh_content = _SUBMIT_SH_TMPL.substitute(vasp_exec=vasp_exec)
 
     distance_of_ion_matrix = calculate_distance_of_ion(rwigs_values)
 
@@ -373,20 +461,11 @@ srun --ntasks=16 --cpus-per-task=1 \\
         count_of_element = config.atom_counts[config.elements.index(element_with_largest_rwigs)]
         base_area = count_of_element * math.pi * (largest_rwigs_value**2)
 
-    files_to_copy = [
-        "INCAR_1",
-        "INCAR_2",
-        "POTCAR",
-        calypso_fullnode_script,
-        calypso_script,
-        "submit.sh",
-    ]
-
-    created_directories: List[Path] = []
+    staged_potcar = destination / "POTCAR"
 
-    for formula_value in config.formula_multipliers:
+    def _build_one(formula_value: int) -> Path:
         new_dir_path = destination / f"{formula_value}"
-        new_dir_path.mkdir(parents=True, exist_ok=True)
+        new_dir_path.mkdir(exist_ok=True)
 
         adjusted_atom_counts = [count * formula_value for count in config.atom_counts]
 
@@ -410,17 +489,31 @@ srun --ntasks=16 --cpus-per-task=1 \\
             formula_value=formula_value,
         )
 
-        for file_name in files_to_copy:
-            shutil.copy(destination / file_name, new_dir_path / file_name)
-
-        print(f"Set up directory {new_dir_path}")
-        created_directories.append(new_dir_path)
-
-    for file_name in files_to_copy:
-        try:
-            (destination / file_name).unlink()
-        except Exception as exc:  # pragma: no cover - informational
-            print(f"Error occurred while deleting {(destination / file_name)}: {exc}")
+        create_incar(incar_1_content, new_dir_path, "INCAR_1")
+        create_incar(incar_2_content, new_dir_path, "INCAR_2")
+        create_simple_file(calypso_fullnode_script, calypso_fullnode_content, new_dir_path)
+        create_simple_file(calypso_script, calypso_content, new_dir_path)
+        create_simple_file("submit.sh", submit_sh_content, new_dir_path)
+        _clone(staged_potcar, new_dir_path / "POTCAR")
+
+        return new_dir_path
+
+    # Each formula directory is independent file I/O, so overlap them on threads.
+    # Repeated multipliers map to the same directory; build each one once so no
+    # two workers ever write into the same directory.
+    formula_multipliers = list(dict.fromkeys(config.formula_multipliers))
+    max_workers = max(1, min(8, len(formula_multipliers)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        created_directories = list(executor.map(_build_one, formula_multipliers))
+
+    # Report from the calling thread so messages stay ordered and unmixed.
+    for new_dir_path in created_directories:
+        _log.info("Set up directory %s", new_dir_path)
+
+    try:
+        staged_potcar.unlink()
+    except Exception as exc:  # pragma: no cover - informational
+        _log.warning("Error occurred while deleting %s: %s", staged_potcar, exc)
 
     return created_directories
 
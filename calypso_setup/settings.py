@@ -1,6 +1,7 @@
 """Configuration loading for calypso_setup."""
 from __future__ import annotations
 
+import functools
 import json
 from dataclasses import dataclass
 from pathlib import Path
@@ -9,7 +10,7 @@ from pathlib import Path
 DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.json"
 
 
-@dataclass
+@dataclass(frozen=True)
 class ToolSettings:
     potcar_root: Path
     calypso_executable: str
@@ -25,8 +26,17 @@ class ToolSettings:
 
 
 def load_settings(path: Path | None) -> ToolSettings:
-    config_path = path if path is not None else DEFAULT_CONFIG_PATH
-    config_path = config_path.expanduser()
+    config_path = Path(path) if path is not None else DEFAULT_CONFIG_PATH
+    return _load_settings_cached(str(config_path.expanduser().resolve()))
+
+
+@functools.lru_cache(maxsize=8)
+def _load_settings_cached(path_str: str) -> ToolSettings:
+    """Read and parse the config at *path_str*, memoized per path.
+
+    Call ``_load_settings_cached.cache_clear()`` after editing a config file.
+    """
+    config_path = Path(path_str)
     if not config_path.is_file():
         raise FileNotFoundError(
             f"Configuration file not found at {config_path}. "
@@ -0,0 +1,25 @@
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+import pytest
+
+
+@pytest.fixture
+def write_potcars(tmp_path: Path) -> Callable[..., Path]:
+    """Return a helper that lays out ``<root>/<dir>/POTCAR`` files.
+
+    *contents* maps directory names (e.g. ``"Fe_pv"``) to POTCAR text or bytes;
+    *root* defaults to ``tmp_path / "potcars"``.
+    """
+
+    def _write(
+        contents: Dict[str, Union[str, bytes]], root: Optional[Path] = None
+    ) -> Path:
+        potcar_root = root if root is not None else tmp_path / "potcars"
+        for name, body in contents.items():
+            (potcar_root / name).mkdir(parents=True, exist_ok=True)
+            data = body if isinstance(body, bytes) else body.encode("utf-8")
+            (potcar_root / name / "POTCAR").write_bytes(data)
+        return potcar_root
+
+    return _write
@@ -1,9 +1,11 @@
 from pathlib import Path
+from typing import Callable
 
 import pytest
 
 from calypso_setup.builder import (
     _format_pstress_kbar,
+    _list_potcar_dirs,
     adjust_input_dat,
     calculate_distance_of_ion,
     create_input_dat,
@@ -14,6 +16,8 @@ from calypso_setup.builder import (
 def test_format_pstress_kbar_formats_integer_and_decimal_values() -> None:
     assert _format_pstress_kbar(250.0) == "2500"
     assert _format_pstress_kbar(12.34) == "123.4"
+    assert _format_pstress_kbar(5) == "50"
+    assert _format_pstress_kbar(0.5) == "5"
 
 
 def test_format_pstress_kbar_rejects_negative_pressure() -> None:
@@ -44,21 +48,43 @@ def test_adjust_input_dat_scales_name_and_atom_counts(tmp_path: Path) -> None:
     assert "Other = keep" in content
 
 
-def test_find_potcar_reads_rwigs_and_writes_combined_file(tmp_path: Path) -> None:
-    potcar_root = tmp_path / "potcars"
-    (potcar_root / "Fe_pv").mkdir(parents=True)
-    (potcar_root / "O").mkdir(parents=True)
+@pytest.mark.parametrize(
+    ("original", "expected"),
+    [
+        (
+            b"SystemName = Fe1O1\r\nNumberOfAtoms = 1 1\r\nOther = keep\r\n",
+            b"SystemName = Fe1O13\nNumberOfAtoms = 3 3\nOther = keep\n",
+        ),
+        (
+            b"SystemName =   Fe1O1  \nNumberOfAtoms =  1 2 \t\nOther = keep\n",
+            b"SystemName = Fe1O13\nNumberOfAtoms = 3 6\nOther = keep\n",
+        ),
+        (
+            b"SystemName = Fe1O1\nOther = keep\nNumberOfAtoms = 3",
+            b"SystemName = Fe1O13\nOther = keep\nNumberOfAtoms = 9\n",
+        ),
+    ],
+    ids=["crlf", "padded-values", "last-line-without-newline"],
+)
+def test_adjust_input_dat_normalizes_rewritten_lines(
+    tmp_path: Path, original: bytes, expected: bytes
+) -> None:
+    input_dat = tmp_path / "input.dat"
+    input_dat.write_bytes(original)
 
-    (potcar_root / "Fe_pv" / "POTCAR").write_text(
-        "Fe POTCAR\nRWIGS = 1.20; RWIGS = 1.10\n",
-        encoding="utf-8",
-    )
-    (potcar_root / "O" / "POTCAR").write_text(
-        "O POTCAR\nRWIGS = 0.80\n",
-        encoding="utf-8",
+    adjust_input_dat(input_dat, multiplier=3)
+
+    assert input_dat.read_bytes() == expected
+
+def test_find_potcar_reads_rwigs_and_writes_combined_file(
+    tmp_path: Path, write_potcars: Callable[..., Path]
+) -> None:
+    potcar_root = write_potcars(
+        {"Fe_pv": "Fe POTCAR\nRWIGS = 1.20; RWIGS = 1.10\n", "O": "O POTCAR\nRWIGS = 0.80\n"}
     )
 
     destination = tmp_path / "dest"
+    destination.mkdir()
     rwigs_values, min_latom_dis = find_potcar(["Fe", "O"], destination, potcar_root=potcar_root)
 
     assert rwigs_values == {"Fe": 1.1, "O": 0.8}
@@ -68,6 +94,73 @@ def test_find_potcar_reads_rwigs_and_writes_combined_file(tmp_path: Path) -> Non
     assert "O POTCAR" in combined
 
 
+def test_find_potcar_sees_new_dirs_after_cache_clear(
+    tmp_path: Path, write_potcars: Callable[..., Path]
+) -> None:
+    potcar_root = write_potcars({"Fe": "Fe POTCAR\nRWIGS = 1.20\n"})
+
+    destination = tmp_path / "dest"
+    destination.mkdir()
+    find_potcar(["Fe"], destination, potcar_root=potcar_root)
+
+    write_potcars({"O": "O POTCAR\nRWIGS = 0.80\n"})
+    with pytest.raises(FileNotFoundError):
+        find_potcar(["Fe", "O"], destination, potcar_root=potcar_root)
+
+    _list_potcar_dirs.cache_clear()
+    rwigs_values, _ = find_potcar(["Fe", "O"], destination, potcar_root=potcar_root)
+    assert rwigs_values == {"Fe": 1.2, "O": 0.8}
+
+
+def test_find_potcar_relative_root_follows_working_directory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, write_potcars: Callable[..., Path]
+) -> None:
+    write_potcars({"Fe": "Fe POTCAR\nRWIGS = 1.20\n"}, root=tmp_path / "a" / "pots")
+    write_potcars({"O": "O POTCAR\nRWIGS = 0.80\n"}, root=tmp_path / "b" / "pots")
+
+    monkeypatch.chdir(tmp_path / "a")
+    rwigs_values, _ = find_potcar(["Fe"], tmp_path, potcar_root=Path("pots"))
+    assert rwigs_values == {"Fe": 1.2}
+
+    monkeypatch.chdir(tmp_path / "b")
+    rwigs_values, _ = find_potcar(["O"], tmp_path, potcar_root=Path("pots"))
+    assert rwigs_values == {"O": 0.8}
+
+
+def test_find_potcar_handles_non_utf8_bytes(
+    tmp_path: Path, write_potcars: Callable[..., Path]
+) -> None:
+    raw = b"Fe POTCAR\nRWIGS = 1.20; RWIGS = 1.10\n\xff\xfe body\n"
+    potcar_root = write_potcars({"Fe": raw})
+
+    destination = tmp_path / "dest"
+    destination.mkdir()
+    rwigs_values, _ = find_potcar(["Fe"], destination, potcar_root=potcar_root)
+
+    assert rwigs_values == {"Fe": 1.1}
+    assert (destination / "POTCAR").read_bytes() == raw
+
+
+def test_find_potcar_failure_leaves_existing_potcar_untouched(
+    tmp_path: Path, write_potcars: Callable[..., Path]
+) -> None:
+    potcar_root = write_potcars(
+        {"Fe": "Fe POTCAR\nRWIGS = 1.20\n", "O": "O POTCAR without radius\n"}
+    )
+
+    destination = tmp_path / "dest"
+    destination.mkdir()
+    (destination / "POTCAR").write_text("existing\n", encoding="utf-8")
+
+    with pytest.raises(FileNotFoundError):
+        find_potcar(["Fe", "Xx"], destination, potcar_root=potcar_root)
+    with pytest.raises(ValueError, match="No RWIGS entry"):
+        find_potcar(["Fe", "O"], destination, potcar_root=potcar_root)
+
+    assert (destination / "POTCAR").read_text(encoding="utf-8") == "existing\n"
+    assert sorted(path.name for path in destination.iterdir()) == ["POTCAR"]
+
+
 def test_create_input_dat_requires_base_area_for_2d(tmp_path: Path) -> None:
     with pytest.raises(ValueError, match="base_area must be provided"):
         create_input_dat(
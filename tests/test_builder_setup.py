@@ -1,15 +1,19 @@
+import logging
 from pathlib import Path
+from typing import Callable
 
+import pytest
+
+from calypso_setup import builder
 from calypso_setup.builder import SetupConfig, setup_calypso
 
+FE_POTCAR = "Fe POTCAR\nRWIGS = 1.20\n"
 
-def test_setup_calypso_generates_expected_structure(tmp_path: Path) -> None:
-    potcar_root = tmp_path / "potcars"
-    (potcar_root / "Fe").mkdir(parents=True)
-    (potcar_root / "Fe" / "POTCAR").write_text(
-        "Fe POTCAR\nRWIGS = 1.20; RWIGS = 1.10\n",
-        encoding="utf-8",
-    )
+
+def test_setup_calypso_generates_expected_structure(
+    tmp_path: Path, write_potcars: Callable[..., Path]
+) -> None:
+    potcar_root = write_potcars({"Fe": "Fe POTCAR\nRWIGS = 1.20; RWIGS = 1.10\n"})
 
     destination = tmp_path / "run"
     config = SetupConfig(
@@ -34,7 +38,7 @@ def test_setup_calypso_generates_expected_structure(tmp_path: Path) -> None:
         assert (formula_path / "INCAR_2").is_file()
         assert (formula_path / "submit.sh").is_file()
 
-    # setup_calypso writes then deletes temporary top-level files.
+    # Only POTCAR is staged at the top level, and it is removed afterwards.
     assert not (destination / "INCAR_1").exists()
     assert not (destination / "INCAR_2").exists()
     assert not (destination / "POTCAR").exists()
@@ -47,3 +51,119 @@ def test_setup_calypso_generates_expected_structure(tmp_path: Path) -> None:
     assert "NumberOfAtoms = 1" in input_one
     assert "NumberOfAtoms = 2" in input_two
     assert "/opt/vasp/bin/vasp_std" in submit_sh
+
+
+def test_setup_calypso_rerun_does_not_touch_other_directories(
+    tmp_path: Path, write_potcars: Callable[..., Path]
+) -> None:
+    potcar_root = write_potcars({"Fe": FE_POTCAR, "O": "O POTCAR\nRWIGS = 0.80\n"})
+
+    destination = tmp_path / "run"
+    setup_calypso(
+        SetupConfig(
+            elements=["Fe", "O"],
+            atom_counts=[1, 1],
+            formula_multipliers=[1, 2],
+            destination=destination,
+            potcar_root=potcar_root,
+        )
+    )
+    original_potcar = (destination / "2" / "POTCAR").read_text(encoding="utf-8")
+
+    setup_calypso(
+        SetupConfig(
+            elements=["O"],
+            atom_counts=[1],
+            formula_multipliers=[1],
+            destination=destination,
+            potcar_root=potcar_root,
+        )
+    )
+
+    assert (destination / "2" / "POTCAR").read_text(encoding="utf-8") == original_potcar
+    assert "Fe POTCAR" in original_potcar
+    assert "Fe POTCAR" not in (destination / "1" / "POTCAR").read_text(encoding="utf-8")
+
+
+def test_setup_calypso_builds_repeated_multipliers_once(
+    tmp_path: Path, write_potcars: Callable[..., Path]
+) -> None:
+    potcar_root = write_potcars({"Fe": FE_POTCAR})
+
+    destination = tmp_path / "run"
+    created = setup_calypso(
+        SetupConfig(
+            elements=["Fe"],
+            atom_counts=[1],
+            formula_multipliers=[2, 1, 2],
+            destination=destination,
+            potcar_root=potcar_root,
+        )
+    )
+
+    assert created == [destination / "2", destination / "1"]
+    assert (destination / "2" / "POTCAR").read_text(encoding="utf-8").startswith("Fe POTCAR")
+    assert not (destination / "POTCAR").exists()
+
+
+def test_setup_calypso_returns_directories_in_input_order(
+    tmp_path: Path, write_potcars: Callable[..., Path]
+) -> None:
+    destination = tmp_path / "run"
+    created = setup_calypso(
+        SetupConfig(
+            elements=["Fe"],
+            atom_counts=[1],
+            formula_multipliers=[3, 1, 4, 2],
+            destination=destination,
+            potcar_root=write_potcars({"Fe": FE_POTCAR}),
+        )
+    )
+
+    assert created == [destination / str(value) for value in (3, 1, 4, 2)]
+
+
+def test_setup_calypso_propagates_worker_errors(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, write_potcars: Callable[..., Path]
+) -> None:
+    real_create_input_dat = builder.create_input_dat
+
+    def failing_create_input_dat(directory, *args, **kwargs):
+        if kwargs["formula_value"] == 2:
+            raise RuntimeError("boom")
+        real_create_input_dat(directory, *args, **kwargs)
+
+    monkeypatch.setattr(builder, "create_input_dat", failing_create_input_dat)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        setup_calypso(
+            SetupConfig(
+                elements=["Fe"],
+                atom_counts=[1],
+                formula_multipliers=[1, 2, 3],
+                destination=tmp_path / "run",
+                potcar_root=write_potcars({"Fe": FE_POTCAR}),
+            )
+        )
+
+
+def test_setup_calypso_logs_progress(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture, write_potcars: Callable[..., Path]
+) -> None:
+    potcar_root = write_potcars({"Fe": FE_POTCAR})
+    destination = tmp_path / "run"
+
+    with caplog.at_level(logging.INFO, logger="calypso_setup.builder"):
+        setup_calypso(
+            SetupConfig(
+                elements=["Fe"],
+                atom_counts=[1],
+                formula_multipliers=[1],
+                destination=destination,
+                potcar_root=potcar_root,
+            )
+        )
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert f"Fe: POTCAR read from {potcar_root / 'Fe' / 'POTCAR'}" in messages
+    assert f"Set up directory {destination / '1'}" in messages
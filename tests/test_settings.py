@@ -1,3 +1,4 @@
+import dataclasses
 import json
 from pathlib import Path
 
@@ -31,3 +32,46 @@ def test_load_settings_raises_for_missing_file(tmp_path: Path) -> None:
 
     with pytest.raises(FileNotFoundError):
         load_settings(missing_path)
+
+
+def test_load_settings_reuses_cached_frozen_settings(tmp_path: Path) -> None:
+    config_path = tmp_path / "config.json"
+    config_path.write_text(
+        json.dumps(
+            {
+                "potcar_root": str(tmp_path / "potcars"),
+                "calypso_executable": "/opt/calypso/bin/calypso.x",
+                "vasp_executable": "/opt/vasp/bin/vasp_std",
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    first = load_settings(config_path)
+
+    assert load_settings(config_path) is first
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.vasp_executable = "mutated"  # type: ignore[misc]
+
+
+def test_load_settings_relative_path_follows_working_directory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "config.json").write_text(
+            json.dumps(
+                {
+                    "potcar_root": str(tmp_path / "potcars"),
+                    "calypso_executable": "/opt/calypso/bin/calypso.x",
+                    "vasp_executable": f"/opt/vasp/{name}/vasp_std",
+                }
+            ),
+            encoding="utf-8",
+        )
+
+    monkeypatch.chdir(tmp_path / "a")
+    assert load_settings(Path("config.json")).vasp_executable == "/opt/vasp/a/vasp_std"
+
+    monkeypatch.chdir(tmp_path / "b")
+    assert load_settings(Path("config.json")).vasp_executable == "/opt/vasp/b/vasp_std"